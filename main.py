@@ -13,27 +13,46 @@
 依赖环境：
 - requests
 - pytz
+- pyahocorasick（可选，安装后词组匹配改用Aho-Corasick自动机）
+- orjson（可选，安装后JSON解析与序列化改用orjson）
 
 安装方法：
-pip install requests pytz
+pip install requests pytz pyahocorasick orjson
 """
 
 import json
 import time
 import random
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Tuple, Optional, Union
 from pathlib import Path
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pytz
-import re
+
+try:
+    import ahocorasick
+except ImportError:  # 未安装pyahocorasick时退回逐词子串匹配
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时使用标准库json
+    orjson = None
 
 # ----------------------------- 配置区域 -----------------------------
 
 CONFIG = {
     "FEISHU_SEPARATOR": "━━━━━━━━━━━━━━━━━━━",  # 飞书消息正文分割线
     "REQUEST_INTERVAL": 1000,  # 请求时间间隔，单位毫秒
+    "MAX_WORKERS": 10,  # 并发爬取的最大线程数
     "FEISHU_REPORT_TYPE": "daily",  # 飞书报告类型，暂未影响逻辑
     "RANK_THRESHOLD": 5,  # 排名高亮阈值
     "USE_PROXY": False,  # 是否启用代理，开启请设置默认代理地址
@@ -49,43 +68,87 @@ CONFIG = {
     "CONTINUE_CRAWL_IF_PUSH_ALL_OFF": True,
 }
 
+# 推送地址在导入时解析一次，避免每次推送重复读取环境变量和配置
+FEISHU_WEBHOOK_URL = os.environ.get("FEISHU_WEBHOOK_URL", CONFIG["FEISHU_WEBHOOK_URL"])
+BARK_DEVICE_KEY = CONFIG.get("BARK_DEVICE_KEY", "")
+BARK_SERVER_URL = CONFIG.get("BARK_SERVER_URL", "https://api.day.app")
+
+# ----------------------------- JSON编解码 ---------------------------
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        # 与orjson输出一致：不转义中文、不加多余空格，减小请求体
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# POST JSON请求体时使用的固定请求头
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# ----------------------------- HTTP会话 -----------------------------
+
+# 推送使用的全局HTTP会话，连接池保持长连接，避免每次请求重新进行TCP和TLS握手；
+# 仅在建立连接失败（请求尚未发出）时重试，读超时和错误状态码不重试，避免飞书和Bark消息重复推送
+_SESSION = requests.Session()
+_PUSH_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _PUSH_ADAPTER)
+_SESSION.mount("http://", _PUSH_ADAPTER)
+
 # ----------------------------- 时间工具 -----------------------------
 
 
+# 时区对象只创建一次，避免每次取时间都查询pytz时区表
+_BEIJING_TZ = pytz.timezone("Asia/Shanghai")
+
+
 class TimeHelper:
     """时间相关工具"""
 
     @staticmethod
     def get_beijing_time() -> datetime:
         """获取当前北京时间（带时区）"""
-        return datetime.now(pytz.timezone("Asia/Shanghai"))
+        return datetime.now(_BEIJING_TZ)
 
     @staticmethod
-    def format_date_folder() -> str:
-        """格式化当前日期 YYYY年MM月DD日，适合文件夹命名"""
-        return TimeHelper.get_beijing_time().strftime("%Y年%m月%d日")
+    def format_date_folder(now: Optional[datetime] = None) -> str:
+        """格式化日期 YYYY年MM月DD日，适合文件夹命名；未传入now时取当前北京时间"""
+        return (now or TimeHelper.get_beijing_time()).strftime("%Y年%m月%d日")
 
     @staticmethod
-    def format_time_filename() -> str:
-        """格式化当前时间 HH时MM分，适合文件命名"""
-        return TimeHelper.get_beijing_time().strftime("%H时%M分")
+    def format_time_filename(now: Optional[datetime] = None) -> str:
+        """格式化时间 HH时MM分，适合文件命名；未传入now时取当前北京时间"""
+        return (now or TimeHelper.get_beijing_time()).strftime("%H时%M分")
 
 
 # --------------------------- 文件及目录 ----------------------------
 
 
+# 本进程中已确认存在的目录，避免重复mkdir
+_ensured_dirs = set()
+
+
 class FileHelper:
     """文件操作工具"""
 
     @staticmethod
     def ensure_directory_exists(directory: str) -> None:
         """确保目录存在，如果不存在则创建"""
+        if directory in _ensured_dirs:
+            return
         Path(directory).mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(directory)
 
     @staticmethod
-    def get_output_path(subfolder: str, filename: str) -> str:
+    def get_output_path(subfolder: str, filename: str, now: Optional[datetime] = None) -> str:
         """生成输出路径，结构为：output/日期目录/subfolder/filename"""
-        date_folder = TimeHelper.format_date_folder()
+        date_folder = TimeHelper.format_date_folder(now)
         output_dir = Path("output") / date_folder / subfolder
         FileHelper.ensure_directory_exists(str(output_dir))
         return str(output_dir / filename)
@@ -94,54 +157,88 @@ class FileHelper:
 # --------------------------- 数据爬取 ------------------------------
 
 
+class RateLimiter:
+    """
+    线程安全的请求节流器：相邻两次放行至少间隔interval_ms毫秒（带少量随机抖动），
+    只限制请求发起的节奏，不等待已发出的请求完成。
+    """
+
+    def __init__(self, interval_ms: int, rng: random.Random):
+        self._interval_ms = interval_ms
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self) -> None:
+        """阻塞直到轮到当前请求发起"""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            jitter = self._rng.randint(-10, 20)
+            interval = max(50, self._interval_ms + jitter) / 1000
+            self._next_time = max(now, self._next_time) + interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
 class DataFetcher:
     """负责从指定接口爬取新闻数据"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
+    def __init__(self, proxy_url: Optional[str] = None, seed: Optional[int] = None):
         self.proxy_url = proxy_url
+        # 爬取专用会话：连接池复用到新闻接口的长连接，请求头只设置一次
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            ),
+            "Accept": "application/json, text/plain, */*",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Connection": "keep-alive",
+            "Cache-Control": "no-cache",
+        })
+        # 重试等待与请求节流使用独立的随机数生成器，传入seed可复现等待时间
+        self._rng = random.Random(seed)
+
+    def close(self) -> None:
+        """关闭爬取会话的连接池，之后再次请求会自动重新建立连接"""
+        self.session.close()
 
     def fetch_data(
         self,
-        id_info: Union[str, Tuple[str, str]],
+        id_info: Tuple[str, str],
         max_retries: int = 2,
-        min_retry_wait: int = 3,
-        max_retry_wait: int = 5,
-    ) -> Tuple[Optional[str], str, str]:
+        backoff_base: float = 1,
+        backoff_cap: float = 32,
+        limiter: Optional[RateLimiter] = None,
+    ) -> Tuple[Optional[Dict], str, str]:
         """
         根据ID从接口获取JSON数据，支持重试机制。
+        重试等待采用全抖动指数退避：在[0, min(backoff_cap, backoff_base * 2^重试次数)]内随机取值。
         参数：
-            - id_info: 单字符串ID或(ID, 别名)元组
+            - id_info: (ID, 别名)元组
+            - limiter: 可选的节流器，每次发起请求（含重试）前先获取
         返回:
-            - response文本或None，id值，别名
+            - 解析后的响应数据或None，id值，别名
         """
-        if isinstance(id_info, tuple):
-            id_value, alias = id_info
-        else:
-            id_value = id_info
-            alias = id_value
+        id_value, alias = id_info
 
         url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
 
         proxies = {"http": self.proxy_url, "https": self.proxy_url} if self.proxy_url else None
 
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            ),
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Connection": "keep-alive",
-            "Cache-Control": "no-cache",
-        }
-
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(url, proxies=proxies, headers=headers, timeout=10)
+                if limiter is not None:
+                    limiter.acquire()
+                response = self.session.get(url, proxies=proxies, timeout=10)
                 response.raise_for_status()
-                data_text = response.text
-                data_json = json.loads(data_text)
+                data_json = _json_loads(response.content)
 
                 status = data_json.get("status", "未知")
                 if status not in ["success", "cache"]:
@@ -149,14 +246,12 @@ class DataFetcher:
 
                 status_info = "最新数据" if status == "success" else "缓存数据"
                 print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
+                return data_json, id_value, alias
 
             except Exception as e:
                 retries += 1
                 if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
+                    wait_time = self._rng.uniform(0, min(backoff_cap, backoff_base * (2 ** retries)))
                     print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
                     time.sleep(wait_time)
                 else:
@@ -164,61 +259,84 @@ class DataFetcher:
                     return None, id_value, alias
         return None, id_value, alias
 
+    @staticmethod
+    def _parse_items(data: Dict) -> Dict:
+        """
+        将接口返回的items转为按标题首次出现顺序排列的并行列表，重复标题合并排名。
+        """
+        source = {"titles": [], "ranks": [], "urls": [], "mobile_urls": []}
+        title_to_idx = {}
+        for index, item in enumerate(data.get("items", []), start=1):
+            title = item.get("title", "").strip()
+
+            if title in title_to_idx:
+                source["ranks"][title_to_idx[title]].append(index)
+            else:
+                title_to_idx[title] = len(source["titles"])
+                source["titles"].append(title)
+                source["ranks"].append([index])
+                source["urls"].append(item.get("url", ""))
+                source["mobile_urls"].append(item.get("mobileUrl", ""))
+        return source
+
+    def _fetch_source(
+        self, id_info: Tuple[str, str], limiter: Optional[RateLimiter] = None
+    ) -> Tuple[Optional[Dict], str]:
+        """
+        获取并解析单个ID的数据，返回(解析后的标题数据或None, id值)。
+        """
+        data, id_value, _ = self.fetch_data(id_info, limiter=limiter)
+        if data is None:
+            return None, id_value
+
+        try:
+            return DataFetcher._parse_items(data), id_value
+        except Exception as e:
+            print(f"解析或处理 {id_value} 响应数据失败: {e}")
+            return None, id_value
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: int = CONFIG["REQUEST_INTERVAL"],
+        max_workers: int = CONFIG["MAX_WORKERS"],
     ) -> Tuple[Dict, Dict, List]:
         """
-        批量爬取多个ID对应的热点新闻数据。
+        并发爬取多个ID对应的热点新闻数据，最多同时进行max_workers个请求，
+        相邻请求的发起间隔约为request_interval毫秒。
         返回：
-            - results: {id: {标题: {ranks: [排名], url: str, mobileUrl: str}}}
+            - results: {id: {"titles": [标题], "ranks": [[排名]], "urls": [str], "mobile_urls": [str]}}
+              各列表按标题首次出现的顺序一一对应
             - id_to_alias: {id: 别名}
             - failed_ids: 请求失败的ID列表
         """
+        # 统一为(ID, 别名)元组，后续不再逐个判断类型
+        norm_ids = [x if isinstance(x, tuple) else (x, x) for x in ids_list]
+
         results = {}
-        id_to_alias = {}
+        id_to_alias = dict(norm_ids)
         failed_ids = []
 
-        for i, id_info in enumerate(ids_list):
-            if isinstance(id_info, tuple):
-                id_value, alias = id_info
-            else:
-                id_value = id_info
-                alias = id_value
-
-            id_to_alias[id_value] = alias
-
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results.setdefault(id_value, {})
-                    for index, item in enumerate(data.get("items", []), start=1):
-                        title = item.get("title", "").strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except Exception as e:
-                    print(f"解析或处理 {id_value} 响应数据失败: {e}")
-                    failed_ids.append(id_value)
+        if not norm_ids:
+            return results, id_to_alias, failed_ids
+
+        # 各ID请求相互独立，用线程池并发等待网络响应，响应在各自线程中随到随解析；
+        # map保证结果顺序与ids_list一致
+        limiter = RateLimiter(request_interval, self._rng)
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(norm_ids))) as executor:
+                responses = list(
+                    executor.map(lambda id_info: self._fetch_source(id_info, limiter), norm_ids)
+                )
+        finally:
+            self.close()
+
+        for source, id_value in responses:
+            if source is not None:
+                results[id_value] = source
             else:
                 failed_ids.append(id_value)
 
-            if i < len(ids_list) - 1:
-                jitter = random.randint(-10, 20)
-                actual_interval = max(50, request_interval + jitter)
-                time.sleep(actual_interval / 1000)
-
         print(f"成功采集ID：{list(results.keys())}")
         print(f"失败采集ID：{failed_ids}")
         return results, id_to_alias, failed_ids
@@ -231,56 +349,252 @@ class DataProcessor:
     """处理和保存爬取到的热点新闻数据"""
 
     @staticmethod
-    def save_titles_to_file(results: Dict, id_to_alias: Dict, failed_ids: List) -> str:
+    def _sorted_titles(source: Dict) -> List[Tuple[int, str, List[int], str, str]]:
         """
-        将结果保存为txt文件，格式清晰，包含排名、标题与链接。
-        返回保存文件的完整路径。
+        将单个来源的标题按最小排名排序，返回[(最小排名, 标题, 排名列表, url, mobile_url)]。
+        """
+        sorted_titles = []
+        for title, ranks, url, mobile_url in zip(
+            source["titles"], source["ranks"], source["urls"], source["mobile_urls"]
+        ):
+            # ranks按排名递增顺序追加，首项即为最小排名
+            min_rank = ranks[0] if ranks else 99
+            sorted_titles.append((min_rank, title, ranks, url, mobile_url))
+
+        sorted_titles.sort(key=itemgetter(0))
+        return sorted_titles
+
+    @staticmethod
+    def _format_title_line(rank: int, title: str, url: str, mobile_url: str) -> str:
+        """格式化txt文件中的单行标题"""
+        line = f"{rank}. {title}"
+        if url:
+            line += f" [URL:{url}]"
+        if mobile_url:
+            line += f" [MOBILE:{mobile_url}]"
+        return line
+
+    @staticmethod
+    def _write_lines(
+        lines: List[str], failed_ids: List, id_to_alias: Dict, now: Optional[datetime] = None
+    ) -> str:
         """
+        追加失败ID信息后，将全部行一次性写入txt文件，返回保存文件的完整路径。
+        now决定文件所在日期目录和文件名，未传入时取当前北京时间。
+        """
+        if failed_ids:
+            lines.append("==== 以下ID请求失败 ====")
+            for fail_id in failed_ids:
+                fail_alias = id_to_alias.get(fail_id, fail_id)
+                lines.append(f"{fail_alias} (ID: {fail_id})")
+
+        # 日期目录与文件名取自同一时刻，只获取一次当前时间
+        now = now or TimeHelper.get_beijing_time()
         file_path = FileHelper.get_output_path(
-            "txt", f"{TimeHelper.format_time_filename()}.txt"
+            "txt", f"{TimeHelper.format_time_filename(now)}.txt", now
         )
 
+        # 先在内存中拼好全部行，再一次性写入文件，避免逐行write
         with open(file_path, "w", encoding="utf-8") as f:
-            for id_value, titles_data in results.items():
-                display_name = id_to_alias.get(id_value, id_value)
-                f.write(f"{display_name}\n")
-
-                sorted_titles = []
-                for title, info in titles_data.items():
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                    min_rank = min(ranks) if ranks else 99
-                    sorted_titles.append((min_rank, title, url, mobile_url))
-
-                sorted_titles.sort(key=lambda x: x[0])
-
-                for rank, title, url, mobile_url in sorted_titles:
-                    line = f"{rank}. {title}"
-                    if url:
-                        line += f" [URL:{url}]"
-                    if mobile_url:
-                        line += f" [MOBILE:{mobile_url}]"
-                    f.write(line + "\n")
-
-                f.write("\n")
-
-            if failed_ids:
-                f.write("==== 以下ID请求失败 ====\n")
-                for fail_id in failed_ids:
-                    fail_alias = id_to_alias.get(fail_id, fail_id)
-                    f.write(f"{fail_alias} (ID: {fail_id})\n")
+            f.write("".join(f"{line}\n" for line in lines))
 
         print(f"热点新闻标题已保存到文件：{file_path}")
         return file_path
 
+    @staticmethod
+    def save_titles_to_file(
+        results: Dict, id_to_alias: Dict, failed_ids: List, now: Optional[datetime] = None
+    ) -> str:
+        """
+        将结果保存为txt文件，格式清晰，包含排名、标题与链接。
+        返回保存文件的完整路径。
+        """
+        lines = []
+        for id_value, source in results.items():
+            display_name = id_to_alias.get(id_value, id_value)
+            lines.append(display_name)
+
+            for rank, title, _, url, mobile_url in DataProcessor._sorted_titles(source):
+                lines.append(DataProcessor._format_title_line(rank, title, url, mobile_url))
+
+            lines.append("")
+
+        return DataProcessor._write_lines(lines, failed_ids, id_to_alias, now)
+
+    @staticmethod
+    def save_and_count(
+        results: Dict,
+        id_to_alias: Dict,
+        failed_ids: List,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        rank_threshold: int = CONFIG["RANK_THRESHOLD"],
+        now: Optional[datetime] = None,
+    ) -> Tuple[str, List[Dict]]:
+        """
+        单次遍历全部标题，同时生成txt文件内容并统计词频，
+        等价于依次调用save_titles_to_file和count_word_frequency。
+        返回保存文件的完整路径和排序后的统计列表。
+        """
+        norm_groups, lc_filters, automaton, word_stats, can_match = (
+            StatisticsCalculator._prepare_word_stats(word_groups, filter_words)
+        )
+        tally_title = StatisticsCalculator._tally_title
+
+        lines = []
+        for id_value, source in results.items():
+            source_alias = id_to_alias.get(id_value, id_value)
+            lines.append(source_alias)
+
+            for rank, title, ranks, url, mobile_url in DataProcessor._sorted_titles(source):
+                lines.append(DataProcessor._format_title_line(rank, title, url, mobile_url))
+                # 没有任何词组包含普通词时不会有标题入选，只写文件不做匹配
+                if can_match:
+                    tally_title(
+                        word_stats, norm_groups, lc_filters, automaton,
+                        title, source_alias, ranks, url, mobile_url, rank_threshold,
+                    )
+
+            lines.append("")
+
+        file_path = DataProcessor._write_lines(lines, failed_ids, id_to_alias, now)
+        return file_path, StatisticsCalculator._build_stats_list(word_stats)
+
 
 # ------------------------- 词频统计 -------------------------------
 
 
+# 统计结果中的单条标题记录，比逐条构造字典更省内存
+TitleRec = namedtuple("TitleRec", "title source_alias ranks url mobile_url rank_threshold")
+
+
 class StatisticsCalculator:
     """关键词频率统计与标题筛选"""
 
+    @staticmethod
+    def _normalize_word_rules(
+        word_groups: List[Dict], filter_words: List[str]
+    ) -> Tuple[Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...], Tuple[str, ...]]:
+        """
+        预先将词组与过滤词统一转为小写，避免逐标题重复调用lower()。
+        返回（均为元组，可作为自动机缓存的键）：
+            - norm_groups: ((group_key, 必需词元组, 普通词元组), ...)
+            - lc_filters: 过滤词元组
+        """
+        norm_groups = tuple(
+            (
+                group["group_key"],
+                tuple(word.lower() for word in group.get("required", [])),
+                tuple(word.lower() for word in group.get("normal", [])),
+            )
+            for group in word_groups
+        )
+        lc_filters = tuple(word.lower() for word in filter_words)
+        return norm_groups, lc_filters
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _build_automaton(norm_groups: Tuple[Tuple, ...], lc_filters: Tuple[str, ...]):
+        """
+        将过滤词与各词组的必需词、普通词编译为一个Aho-Corasick自动机，
+        单次扫描标题即可得到命中的全部词语。未安装pyahocorasick或词表为空时返回None。
+        词表含空词时同样返回None：空词按子串规则在任何标题中都算命中，而自动机无法命中空词，
+        退回子串匹配以保证结果与是否安装pyahocorasick无关。
+        相同词表只编译一次，重复调用直接复用已构建的自动机。
+        """
+        if ahocorasick is None:
+            return None
+
+        words = set(lc_filters)
+        for _, required_words, normal_words in norm_groups:
+            words.update(required_words)
+            words.update(normal_words)
+        if not words or "" in words:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _match_group_index(
+        title_lower: str, norm_groups: Tuple[Tuple, ...], lc_filters: Tuple[str, ...], automaton=None
+    ) -> Optional[int]:
+        """
+        返回小写标题应计入的词组下标，不符合规则时返回None。
+        优先排除包含过滤词的标题；标题需满足至少一个含普通词的词组才保留，
+        保留后计入第一个满足必需词和普通词条件的词组。
+        """
+        if automaton is not None:
+            hits = {word for _, word in automaton.iter(title_lower)}
+            # 入选至少需要命中一个普通词，一个词都没命中的标题（绝大多数）直接跳过逐组判断
+            if not hits:
+                return None
+            contains = hits.__contains__
+        else:
+            contains = title_lower.__contains__
+
+        if lc_filters and any(contains(filter_word) for filter_word in lc_filters):
+            return None
+
+        first_index = None
+        for index, (_, required_words, normal_words) in enumerate(norm_groups):
+            # 检查必需词全部存在
+            if required_words and not all(contains(req) for req in required_words):
+                continue
+
+            # 检查普通词至少一个存在
+            if normal_words and not any(contains(norm) for norm in normal_words):
+                continue
+
+            if first_index is None:
+                first_index = index
+            if normal_words:
+                return first_index
+
+        return None
+
+    @staticmethod
+    def _prepare_word_stats(word_groups: List[Dict], filter_words: List[str]) -> Tuple:
+        """
+        整理词频统计所需的规则与累计容器，供count_word_frequency和save_and_count共用。
+        返回(norm_groups, lc_filters, automaton, word_stats, can_match)，
+        can_match为False表示没有任何词组包含普通词，不会有标题入选。
+        """
+        norm_groups, lc_filters = StatisticsCalculator._normalize_word_rules(word_groups, filter_words)
+        automaton = StatisticsCalculator._build_automaton(norm_groups, lc_filters)
+        word_stats = {key: {"count": 0, "titles": []} for key, _, _ in norm_groups}
+        can_match = any(normal_words for _, _, normal_words in norm_groups)
+        return norm_groups, lc_filters, automaton, word_stats, can_match
+
+    @staticmethod
+    def _tally_title(
+        word_stats: Dict,
+        norm_groups: Tuple[Tuple, ...],
+        lc_filters: Tuple[str, ...],
+        automaton,
+        title: str,
+        source_alias: str,
+        ranks: List[int],
+        url: str,
+        mobile_url: str,
+        rank_threshold: int,
+    ) -> None:
+        """
+        过滤不符规则的标题，并计入第一个匹配的词组，一个标题只计入一个词组。
+        """
+        group_index = StatisticsCalculator._match_group_index(
+            title.lower(), norm_groups, lc_filters, automaton
+        )
+        if group_index is None:
+            return
+
+        stat = word_stats[norm_groups[group_index][0]]
+        stat["count"] += 1
+        stat["titles"].append(TitleRec(title, source_alias, ranks, url, mobile_url, rank_threshold))
+
     @staticmethod
     def _matches_word_groups(
         title: str, word_groups: List[Dict], filter_words: List[str]
@@ -288,6 +602,8 @@ class StatisticsCalculator:
         """
         判断标题是否符合词组必需词及不包含过滤词规则。
         优先排除包含过滤词的标题。
+        单条判断时逐词转小写、命中即返回，不预先整理整套词表；
+        批量判断应在循环外调用_normalize_word_rules和_build_automaton，再逐条使用_match_group_index。
         """
         title_lower = title.lower()
         for filter_word in filter_words:
@@ -319,45 +635,31 @@ class StatisticsCalculator:
         """
         统计所有标题符合词组规则的出现频率，返回排序后的统计列表。
         """
-        word_stats = {}
-
-        for group in word_groups:
-            key = group["group_key"]
-            word_stats[key] = {"count": 0, "titles": []}
+        norm_groups, lc_filters, automaton, word_stats, can_match = (
+            StatisticsCalculator._prepare_word_stats(word_groups, filter_words)
+        )
+        # 没有任何词组包含普通词时不会有标题入选，无需逐条转小写匹配
+        if not can_match:
+            return StatisticsCalculator._build_stats_list(word_stats)
 
-        for source_id, titles_data in results.items():
+        tally_title = StatisticsCalculator._tally_title
+        for source_id, source in results.items():
             source_alias = id_to_alias.get(source_id, source_id)
-            for title, info in titles_data.items():
-                # 过滤不符规则的标题
-                if not StatisticsCalculator._matches_word_groups(title, word_groups, filter_words):
-                    continue
-                ranks = info.get("ranks", [])
-                url = info.get("url", "")
-                mobile_url = info.get("mobileUrl", "")
-
-                # 找到第一个匹配的词组，计入统计
-                for group in word_groups:
-                    required_words = group.get("required", [])
-                    normal_words = group.get("normal", [])
-                    key = group["group_key"]
-
-                    title_lower = title.lower()
-                    if required_words and not all(req.lower() in title_lower for req in required_words):
-                        continue
-                    if normal_words and not any(norm.lower() in title_lower for norm in normal_words):
-                        continue
-
-                    word_stats[key]["count"] += 1
-                    word_stats[key]["titles"].append({
-                        "title": title,
-                        "source_alias": source_alias,
-                        "ranks": ranks,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "rank_threshold": rank_threshold,
-                    })
-                    break  # 一个标题只计入第一个匹配组
+            for title, ranks, url, mobile_url in zip(
+                source["titles"], source["ranks"], source["urls"], source["mobile_urls"]
+            ):
+                tally_title(
+                    word_stats, norm_groups, lc_filters, automaton,
+                    title, source_alias, ranks, url, mobile_url, rank_threshold,
+                )
+
+        return StatisticsCalculator._build_stats_list(word_stats)
 
+    @staticmethod
+    def _build_stats_list(word_stats: Dict) -> List[Dict]:
+        """
+        将按词组累计的统计结果转为列表，按出现次数降序排列。
+        """
         stats_list = []
         for k, v in word_stats.items():
             stats_list.append({
@@ -370,27 +672,32 @@ class StatisticsCalculator:
         return stats_list
 
     @staticmethod
-    def format_rank_html(ranks: List[int], rank_threshold: int = 5) -> str:
+    def format_rank_html(ranks: List[int], rank_threshold: int = 5, html: bool = True) -> str:
+        """
+        格式化排名显示，阈值内用红色粗体高亮；html为False时只返回纯文本排名。
+        """
+        return StatisticsCalculator._format_rank_cached(tuple(ranks), rank_threshold, html)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_rank_cached(ranks: Tuple[int, ...], rank_threshold: int, html: bool) -> str:
         """
-        格式化排名显示，阈值内用红色粗体高亮。
+        format_rank_html的缓存实现，相同排名组合只格式化一次。
+        html是缓存键的一部分，飞书与Bark两种渲染互不共用缓存，命中来自同一份报告内重复的排名组合。
         """
         if not ranks:
             return ""
 
-        unique_ranks = sorted(set(ranks))
-        min_rank = unique_ranks[0]
-        max_rank = unique_ranks[-1]
+        min_rank, max_rank = min(ranks), max(ranks)
 
-        if min_rank <= rank_threshold:
-            if min_rank == max_rank:
-                return f"<font color='red'><strong>[{min_rank}]</strong></font>"
-            else:
-                return f"<font color='red'><strong>[{min_rank} - {max_rank}]</strong></font>"
+        if min_rank == max_rank:
+            rank_text = f"[{min_rank}]"
         else:
-            if min_rank == max_rank:
-                return f"[{min_rank}]"
-            else:
-                return f"[{min_rank} - {max_rank}]"
+            rank_text = f"[{min_rank} - {max_rank}]"
+
+        if html and min_rank <= rank_threshold:
+            return f"<font color='red'><strong>{rank_text}</strong></font>"
+        return rank_text
 
 
 # ---------------------------- 报告生成和推送 -------------------------
@@ -400,37 +707,55 @@ class ReportGenerator:
     """将统计结果生成人类可读文本，并推送到飞书和Bark"""
 
     @staticmethod
-    def _render_feishu_content(stats: List[Dict]) -> str:
+    def _render_text_content(stats: List[Dict], html: bool) -> str:
         """
-        生成飞书纯文本报告内容
+        生成文本报告内容，html控制排名是否带高亮标签
         """
         lines = []
+        extend = lines.extend
+        format_rank = StatisticsCalculator.format_rank_html
         for stat in stats:
-            lines.append(f"{stat['word']} (出现次数: {stat['count']})")
-            for title_record in stat["titles"]:
-                rank_html = StatisticsCalculator.format_rank_html(
-                    title_record["ranks"], title_record["rank_threshold"]
-                )
-                lines.append(f"{rank_html} {title_record['title']} — 来源：{title_record['source_alias']}")
-            lines.append("")
+            extend([
+                f"{stat['word']} (出现次数: {stat['count']})",
+                *(
+                    f"{format_rank(ranks, rank_threshold, html)} {title} — 来源：{source_alias}"
+                    for title, source_alias, ranks, _, _, rank_threshold in stat["titles"]
+                ),
+                "",
+            ])
 
         return "\n".join(lines)
 
+    @staticmethod
+    def _render_feishu_content(stats: List[Dict]) -> str:
+        """
+        生成飞书纯文本报告内容
+        """
+        return ReportGenerator._render_text_content(stats, html=True)
+
+    @staticmethod
+    def _render_plain_content(stats: List[Dict]) -> str:
+        """
+        生成Bark使用的纯文本内容，排名不带HTML标签
+        """
+        return ReportGenerator._render_text_content(stats, html=False)
+
     @staticmethod
     def send_to_feishu(text: str) -> bool:
         """
         通过飞书Webhook发送文本消息，返回是否成功
         """
-        webhook_url = os.environ.get("FEISHU_WEBHOOK_URL", CONFIG["FEISHU_WEBHOOK_URL"])
+        webhook_url = FEISHU_WEBHOOK_URL
         if not webhook_url:
             print("飞书Webhook未配置，跳过发送。")
             return False
 
-        headers = {"Content-Type": "application/json; charset=utf-8"}
         payload = {"msg_type": "text", "content": {"text": text}}
 
         try:
-            response = requests.post(webhook_url, json=payload, headers=headers, timeout=10)
+            response = _SESSION.post(
+                webhook_url, data=_json_dumps(payload), headers=_JSON_HEADERS, timeout=10
+            )
             if response.status_code == 200:
                 print("飞书推送成功")
                 return True
@@ -441,29 +766,27 @@ class ReportGenerator:
         return False
 
     @staticmethod
-    def send_to_bark(stats: List[Dict], report_type: str = "热点新闻推送") -> bool:
+    def send_to_bark(
+        stats: List[Dict], report_type: str = "热点新闻推送", now: Optional[datetime] = None
+    ) -> bool:
         """
-        给Bark服务推送简要消息，标题使用第一个关键词，消息正文转换自飞书内容。
+        给Bark服务推送简要消息，标题使用第一个关键词，消息正文为纯文本报告。
+        now为副标题中的更新时间，未传入时取当前北京时间。
         """
         if not CONFIG.get("BARK_ENABLE", False):
             print("Bark推送已关闭，跳过发送。")
             return False
 
-        device_key = CONFIG.get("BARK_DEVICE_KEY", "")
-        server_url = CONFIG.get("BARK_SERVER_URL", "https://api.day.app")
+        device_key = BARK_DEVICE_KEY
+        server_url = BARK_SERVER_URL
 
         if not device_key:
             print("Bark设备Key未设置，跳过推送。")
             return False
 
-        def html_to_plain(text: str) -> str:
-            text = re.sub(r"<.*?>", "", text)
-            return text.strip()
-
-        body = ReportGenerator._render_feishu_content(stats)
-        bark_body = html_to_plain(body)
+        bark_body = ReportGenerator._render_plain_content(stats).strip()
         first_word = stats[0]["word"] if stats else "热点新闻"
-        now_str = TimeHelper.get_beijing_time().strftime("%Y-%m-%d %H:%M:%S")
+        now_str = (now or TimeHelper.get_beijing_time()).strftime("%Y-%m-%d %H:%M:%S")
 
         title = f"{first_word} - {report_type}"
         subtitle = f"更新时间：{now_str}"
@@ -478,7 +801,7 @@ class ReportGenerator:
         url = f"{server_url.rstrip('/')}/{device_key}"
 
         try:
-            resp = requests.get(url, params=params, timeout=10)
+            resp = _SESSION.get(url, params=params, timeout=10)
             if resp.status_code == 200:
                 print(f"Bark推送成功 [{report_type}]")
                 return True
@@ -502,7 +825,9 @@ class NewsAnalyzer:
         self.fetcher = DataFetcher(proxy_url=proxy)
 
     def run(self):
-        print(f"当前北京时间: {TimeHelper.get_beijing_time().strftime('%Y-%m-%d %H:%M:%S')}")
+        # 本轮的文件目录、文件名与推送时间统一取自同一时刻
+        now = TimeHelper.get_beijing_time()
+        print(f"当前北京时间: {now.strftime('%Y-%m-%d %H:%M:%S')}")
 
         feishu_on = CONFIG.get("FEISHU_ENABLE", False)
         bark_on = CONFIG.get("BARK_ENABLE", False)
@@ -516,7 +841,7 @@ class NewsAnalyzer:
                 return
 
         # 飞书Webhook地址获取及提示（不退出）
-        webhook_url = os.environ.get("FEISHU_WEBHOOK_URL", CONFIG["FEISHU_WEBHOOK_URL"])
+        webhook_url = FEISHU_WEBHOOK_URL
         if not webhook_url and feishu_on:
             print("警告：飞书Webhook地址未设置，飞书推送将跳过。")
 
@@ -530,37 +855,34 @@ class NewsAnalyzer:
         # 1. 爬取数据
         results, id_to_alias, failed_ids = self.fetcher.crawl_websites(ids_to_crawl)
 
-        # 2. 保存爬取数据到文件
-        DataProcessor.save_titles_to_file(results, id_to_alias, failed_ids)
-
-        # 3. 词频规则配置（示例）
+        # 2. 词频规则配置（示例）
         example_word_groups = [
             {"required": [], "normal": ["世界杯"], "group_key": "世界杯"},
             {"required": ["足球"], "normal": ["赛事", "比赛"], "group_key": "足球赛事"},
         ]
         example_filter_words = ["虚假"]  # 示例过滤词（标题中包含则剔除）
 
-        # 4. 统计词频
-        stats = StatisticsCalculator.count_word_frequency(
-            results, example_word_groups, example_filter_words, id_to_alias
+        # 3. 保存爬取数据到文件，同时统计词频
+        _, stats = DataProcessor.save_and_count(
+            results, id_to_alias, failed_ids, example_word_groups, example_filter_words, now=now
         )
 
         if not stats:
             print("无符合词频统计的标题，推送内容为空，结束程序。")
             return
 
-        # 5. 构造飞书推送文本并打印（便于调试）
+        # 4. 构造飞书推送文本并打印（便于调试）
         feishu_text = ReportGenerator._render_feishu_content(stats)
         print("飞书推送内容预览：\n", feishu_text)
 
-        # 6. 执行推送（根据开关）
+        # 5. 执行推送（根据开关）
         if feishu_on and webhook_url:
             ReportGenerator.send_to_feishu(feishu_text)
         else:
             print("飞书推送关闭或未配置Webhook，跳过飞书推送。")
 
         if bark_on:
-            ReportGenerator.send_to_bark(stats)
+            ReportGenerator.send_to_bark(stats, now=now)
         else:
             print("Bark推送关闭，跳过Bark推送。")
 